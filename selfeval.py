@@ -1,9 +1,10 @@
 # SelfEval module
 
 import ast
+import functools
 import re
-import tokenize
-from io import BytesIO
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
 
 # Language quality criteria
 CRITERIA_DESCRIPTIONS = {
@@ -19,6 +20,29 @@ CRITERIA_DESCRIPTIONS = {
     "best_practices": "Code follows language-specific best practices."
 }
 
+# Precompiled patterns used by the evaluators
+_VAR_RE = re.compile(r"\b([a-z_][a-z0-9_]*) *=[^=]")
+_SNAKE_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+# Long lines past which the readability deduction no longer changes
+_LONG_LINE_CAP = 3
+
+# Short variable names that are conventional and not penalized
+_COMMON_SHORT = frozenset({'i', 'j', 'k', 'x', 'y', 'z'})
+
+# AST node types treated as for loops and comprehensions
+_LOOP_NODES = (ast.For, ast.AsyncFor)
+_COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# AST node types for try statements (TryStar is Python 3.11+)
+_TRY_NODES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+# AST node types that can carry a docstring
+_DOCSTRING_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# AST fields holding only expression contexts and operator singletons
+_SKIPPED_FIELDS = frozenset({"ctx", "op", "ops"})
+
 # Default criteria to evaluate if none specified
 DEFAULT_CRITERIA = [
     "correctness",
@@ -28,75 +52,246 @@ DEFAULT_CRITERIA = [
     "best_practices"
 ]
 
-def count_lines(code):
-    """Count non-empty, non-comment lines of code"""
-    lines = code.strip().split("\n")
-    count = 0
+# Overall summaries, from lowest to highest scoring, and the percentages at
+# which each one after the first starts
+_SUMMARY_THRESHOLDS = (40, 60, 80)
+_SUMMARIES = (
+    "Code has significant issues that should be addressed.",
+    "Code needs improvement in several key areas.",
+    "Solid code with some areas for improvement.",
+    "High-quality code that follows good practices in most areas."
+)
+
+# Smallest batch for which batch_evaluate aggregates with Numba, when installed.
+# Loading the kernel takes around half a second even from Numba's cache, and
+# packing the scores into arrays eats most of what it saves per sample, so it
+# only breaks even at about three million samples.
+_NUMBA_MIN_BATCH = 4_000_000
+
+@dataclass(slots=True, frozen=True)
+class CriterionResult:
+    """Score and explanation for a single criterion"""
+    score: int
+    max_score: int
+    message: str
+
+# Result for criteria skipped because of syntax errors, shared between calls
+_SYNTAX_ERR_RESULT = CriterionResult(0, 10, "Not evaluated due to syntax errors")
+
+@dataclass(slots=True)
+class CodeStats:
+    """Facts about a piece of source code shared by all evaluators"""
+    tree: ast.AST = None
+    code_line_count: int = 0
+    comment_count: int = 0
+    docstring_count: int = 0
+    long_lines: int = 0
+    short_var_count: int = 0
+    func_names: list = field(default_factory=list)
+    inconsistent_indent: bool = False
+    bare_increment: bool = False
+    uses_counter: bool = False
+    uses_range_len: bool = False
+    nested_loop_count: int = 0
+    comprehension_count: int = 0
+    global_count: int = 0
+    magic_number_count: int = 0
+    try_count: int = 0
+    except_count: int = 0
+    bare_except_count: int = 0
+    with_count: int = 0
+
+def _is_call_to(node, name):
+    """Check if node is a call to the builtin with the given name"""
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+def _is_range_len(node):
+    """Check if node is a range(len(...)) call"""
+    return _is_call_to(node, "range") and node.args and _is_call_to(node.args[0], "len")
+
+@functools.cache
+def _child_fields(kind):
+    """Fields of an AST node type worth descending into"""
+    return tuple(name for name in kind._fields if name not in _SKIPPED_FIELDS)
+
+def _collect_structure(stats, tree):
+    """Fill in the structural facts from the parsed tree.
+
+    Walks the tree with an explicit stack rather than ast.walk, which would be
+    the dominant cost here, and skips expression contexts and operators, which
+    make up a large share of the nodes but carry no information.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) for t in node.targets):
+            stats.global_count += 1
+
+    loops_with_nested = set()
+    parent_loop = {}  # Loop node -> nearest enclosing loop node (or None)
+
+    # Each entry is (node, nearest enclosing loop)
+    stack = [(tree, None)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, loop = pop()
+        kind = type(node)
+
+        if kind is ast.Constant:
+            # Ignore 0, 1, -1 as common values
+            value = node.value
+            if type(value) is int and value > 1:
+                stats.magic_number_count += 1
+            continue
+        elif kind in _DOCSTRING_NODES:
+            if ast.get_docstring(node, clean=False) is not None:
+                stats.docstring_count += 1
+            if kind is not ast.Module and kind is not ast.ClassDef:
+                stats.func_names.append(node.name)
+        elif kind in _LOOP_NODES:
+            parent_loop[node] = loop
+            # Every enclosing loop now contains a nested loop
+            outer = loop
+            while outer is not None and outer not in loops_with_nested:
+                loops_with_nested.add(outer)
+                outer = parent_loop[outer]
+            if _is_range_len(node.iter):
+                stats.uses_range_len = True
+            loop = node
+        elif kind is ast.comprehension:
+            if _is_range_len(node.iter):
+                stats.uses_range_len = True
+        elif kind in _COMPREHENSION_NODES:
+            stats.comprehension_count += 1
+        elif kind in _TRY_NODES:
+            stats.try_count += 1
+        elif kind is ast.ExceptHandler:
+            stats.except_count += 1
+            if node.type is None:
+                stats.bare_except_count += 1
+        elif kind is ast.With or kind is ast.AsyncWith:
+            stats.with_count += 1
+
+        for name in _child_fields(kind):
+            value = getattr(node, name, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        push((item, loop))
+            elif isinstance(value, ast.AST):
+                push((value, loop))
+
+    stats.nested_loop_count = len(loops_with_nested)
+
+def _collect_stats(code, tree=None):
+    """Gather the facts used by the evaluators.
+
+    Structural facts come from the AST (parsed here unless the caller passes
+    one in); lexical facts come from the source text.
+    """
+    stats = CodeStats(tree=tree)
+    if tree is None:
+        stats.tree, _ = _parse(code)
+    if stats.tree is not None:
+        _collect_structure(stats, stats.tree)
+    
+    # Strip every line once and classify from the stripped view
+    lines = code.split("\n")
+    stripped = [line.strip() for line in lines]
+    stats.comment_count = sum(1 for line in stripped if line.startswith("#"))
+    stats.code_line_count = sum(
+        1 for line in stripped
+        if line and not line.startswith(("#", '"""')) and not line.endswith('"""')
+    )
+    # PEP 8 recommends 79, but 100 is more lenient. Counting stops one past
+    # the cap, since more long lines can't change the score.
+    for line in stripped:
+        if len(line) > 100:
+            stats.long_lines += 1
+            if stats.long_lines > _LONG_LINE_CAP:
+                break
+    
+    # Indentation is checked on the same lines rather than with a second regex scan
     for line in lines:
-        line = line.strip()
-        if line and not line.startswith("#"):
-            count += 1
-    return count
+        body = line.lstrip(" ")
+        if body and not body[0].isspace() and (len(line) - len(body)) % 4 != 0:
+            stats.inconsistent_indent = True
+            break
+    
+    stats.short_var_count = sum(
+        1 for m in _VAR_RE.finditer(code)
+        if len(m.group(1)) < 3 and m.group(1) not in _COMMON_SHORT
+    )
+    
+    stats.bare_increment = "+= 1" in code
+    stats.uses_counter = "counter" in code.lower()
+    return stats
 
-def evaluate_syntactic_correctness(code):
-    """Check if code has syntax errors"""
+# Parsed trees are tens of times the size of their source, so only the most
+# recent few are kept
+@functools.lru_cache(maxsize=8)
+def _parse(code):
+    """Parse code, returning (tree, None) or (None, error).
+
+    Failures are cached as well as trees, so resubmitting broken code doesn't
+    parse it again. Trees are shared across calls and must not be mutated.
+    """
     try:
-        ast.parse(code)
-        return 10, "No syntax errors detected."
-    except SyntaxError as e:
-        return 0, f"Syntax error at line {e.lineno}: {e.msg}"
+        return ast.parse(code), None
     except Exception as e:
-        return 2, f"Error parsing code: {str(e)}"
+        return None, e.with_traceback(None)
 
-def evaluate_documentation(code):
-    """Evaluate code documentation quality"""
-    # Count docstrings and comments
-    docstring_pattern = r'"""[^"]*"""'
-    docstrings = re.findall(docstring_pattern, code, re.DOTALL)
-    
-    # Count non-empty comment lines
-    comment_count = 0
-    code_lines = 0
-    for line in code.split("\n"):
-        line = line.strip()
-        if line and not line.startswith('"""'): 
-            if line.startswith("#"):
-                comment_count += 1
-            elif not line.endswith('"""'):
-                code_lines += 1
-    
+def _check_syntax(code):
+    """Check if code has syntax errors, also returning the parsed tree (or None)"""
+    tree, error = _parse(code)
+    if tree is not None:
+        return 10, "No syntax errors detected.", tree
+    if isinstance(error, SyntaxError):
+        return 0, f"Syntax error at line {error.lineno}: {error.msg}", None
+    return 2, f"Error parsing code: {str(error)}", None
+
+def evaluate_syntactic_correctness(code):
+    """Check if code has syntax errors"""
+    score, message, _ = _check_syntax(code)
+    return score, message
+
+def evaluate_documentation_from_stats(stats):
+    """Evaluate code documentation quality from precomputed CodeStats"""
     # Evaluate documentation ratio
-    doc_ratio = (len(docstrings) + comment_count) / max(1, code_lines)
+    doc_ratio = (stats.docstring_count + stats.comment_count) / max(1, stats.code_line_count)
     
-    if doc_ratio >= 0.3 and len(docstrings) > 0:
+    if doc_ratio >= 0.3 and stats.docstring_count > 0:
         return 9, "Code is well-documented with clear explanations."
     elif doc_ratio >= 0.15:
         return 6, "Code has adequate documentation but could be improved."
     else:
         return 3, "Code lacks sufficient documentation."
 
-def evaluate_efficiency(code):
-    """Basic evaluation of code efficiency (limited static analysis)"""
+def evaluate_documentation(code):
+    """Evaluate code documentation quality"""
+    return evaluate_documentation_from_stats(_collect_stats(code))
+
+def evaluate_efficiency_from_stats(stats):
+    """Basic evaluation of code efficiency (limited static analysis) from precomputed CodeStats"""
     score = 7  # Start with an average score
     issues = []
     
     # Look for potentially inefficient patterns
-    if "+= 1" in code and "counter" not in code.lower():
+    if stats.bare_increment and not stats.uses_counter:
         issues.append("Consider using more efficient increment methods where applicable")
         score -= 1
     
-    if re.search(r"for\s+\w+\s+in\s+range\(len\(", code):
+    if stats.uses_range_len:
         issues.append("Using range(len()) is less readable than direct iteration")
         score -= 1
     
     # Check for nested loops (potential O(n²) complexity)
-    nested_loop_count = len(re.findall(r"for\s+\w+\s+in[^:]+:[^\n]*\n[^\n]*\s+for\s+\w+\s+in", code))
+    nested_loop_count = stats.nested_loop_count
     if nested_loop_count > 1:
         issues.append(f"Found {nested_loop_count} nested loops; consider optimizing if processing large data")
         score -= min(nested_loop_count, 3)  # Deduct up to 3 points
     
     # Look for list comprehensions (efficient)
-    comprehensions = len(re.findall(r"\[[^\]\[]+for\s+\w+\s+in[^\]\[]+\]", code))
+    comprehensions = stats.comprehension_count
     if comprehensions > 0:
         score += min(comprehensions, 2)  # Add up to 2 points
     
@@ -109,45 +304,37 @@ def evaluate_efficiency(code):
         msg = "Code has potential efficiency issues: " + ("\n".join(issues) if issues else "")
         return score, msg
 
-def evaluate_readability(code):
-    """Evaluate code readability"""
+def evaluate_efficiency(code):
+    """Basic evaluation of code efficiency (limited static analysis)"""
+    return evaluate_efficiency_from_stats(_collect_stats(code))
+
+def evaluate_readability_from_stats(stats):
+    """Evaluate code readability from precomputed CodeStats"""
     score = 7  # Start with an average score
     issues = []
     
     # Check line length
-    long_lines = 0
-    for line in code.split("\n"):
-        if len(line.strip()) > 100:  # PEP 8 recommends 79, but 100 is more lenient
-            long_lines += 1
-    
+    long_lines = stats.long_lines
     if long_lines > 0:
-        issues.append(f"Found {long_lines} lines exceeding recommended length")
-        score -= min(long_lines, 3)  # Deduct up to 3 points
+        shown = long_lines if long_lines <= _LONG_LINE_CAP else f"more than {_LONG_LINE_CAP}"
+        issues.append(f"Found {shown} lines exceeding recommended length")
+        score -= min(long_lines, _LONG_LINE_CAP)  # Deduct up to 3 points
     
     # Check variable naming
-    variable_pattern = r"\b([a-z_][a-z0-9_]*) *=[^=]"
-    variables = re.findall(variable_pattern, code)
-    short_vars = [var for var in variables if len(var) < 3 and var not in ['i', 'j', 'k', 'x', 'y', 'z']]
-    
+    short_vars = stats.short_var_count
     if short_vars:
-        issues.append(f"Found {len(short_vars)} variables with overly short names")
-        score -= min(len(short_vars), 2)
+        issues.append(f"Found {short_vars} variables with overly short names")
+        score -= min(short_vars, 2)
     
     # Check function naming
-    func_pattern = r"def\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    funcs = re.findall(func_pattern, code)
-    non_snake_case = [f for f in funcs if not re.match(r"^[a-z][a-z0-9_]*$", f)]
-    
+    non_snake_case = sum(1 for f in stats.func_names if not _SNAKE_RE.match(f))
     if non_snake_case:
-        issues.append(f"Found {len(non_snake_case)} function names not using snake_case")
-        score -= min(len(non_snake_case), 2)
+        issues.append(f"Found {non_snake_case} function names not using snake_case")
+        score -= min(non_snake_case, 2)
     
     # Check whitespace and indentation consistency
-    inconsistent_indent = False
-    indent_pattern = re.compile(r"^( *)\S")
-    indents = [len(m.group(1)) for m in indent_pattern.finditer(code, re.MULTILINE) if m.group(1)]
-    if indents and any(i % 4 != 0 for i in indents):
-        inconsistent_indent = True
+    if stats.inconsistent_indent:
+        issues.append("Found inconsistent indentation (not a multiple of 4 spaces)")
         score -= 2
     
     if score >= 8:
@@ -159,37 +346,41 @@ def evaluate_readability(code):
         msg = "Code has readability issues: " + ("\n".join(issues) if issues else "")
         return score, msg
 
-def evaluate_best_practices(code):
-    """Evaluate adherence to best practices"""
+def evaluate_readability(code):
+    """Evaluate code readability"""
+    return evaluate_readability_from_stats(_collect_stats(code))
+
+def evaluate_best_practices_from_stats(stats):
+    """Evaluate adherence to best practices from precomputed CodeStats"""
     score = 7  # Start with an average score
     issues = []
     positives = []
     
     # Check for global variables
-    global_vars = re.findall(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=[^=]", code, re.MULTILINE)
-    if len(global_vars) > 3:  # Some globals are okay
-        issues.append(f"Uses {len(global_vars)} global variables")
-        score -= min(len(global_vars) - 3, 2)
+    global_vars = stats.global_count
+    if global_vars > 3:  # Some globals are okay
+        issues.append(f"Uses {global_vars} global variables")
+        score -= min(global_vars - 3, 2)
     
     # Check for magic numbers
     # Ignore 0, 1, -1 as common values
-    magic_numbers = re.findall(r"[^\w\d\.]([2-9]|[1-9]\d+)(?![\d\.])", code)
-    if len(magic_numbers) > 5:
-        issues.append(f"Contains {len(magic_numbers)} magic numbers that should be constants")
-        score -= min(len(magic_numbers) // 5, 2)
+    magic_numbers = stats.magic_number_count
+    if magic_numbers > 5:
+        issues.append(f"Contains {magic_numbers} magic numbers that should be constants")
+        score -= min(magic_numbers // 5, 2)
     
     # Check for exception handling
-    try_blocks = code.count("try:")
-    except_blocks = code.count("except")
-    if try_blocks > 0 and try_blocks == except_blocks and "except:" not in code:  # Good practice
+    try_blocks = stats.try_count
+    except_blocks = stats.except_count
+    if try_blocks > 0 and try_blocks == except_blocks and not stats.bare_except_count:  # Good practice
         positives.append("Uses proper exception handling")
         score += 1
-    elif "except:" in code:  # Bare except is bad practice
+    elif stats.bare_except_count:  # Bare except is bad practice
         issues.append("Uses bare except clauses without specifying exception types")
         score -= 1
     
     # Check for context managers (with statements)
-    with_count = code.count("with")
+    with_count = stats.with_count
     if with_count > 0:
         positives.append(f"Uses context managers ({with_count} with statements)")
         score += min(with_count, 2)
@@ -203,95 +394,189 @@ def evaluate_best_practices(code):
         msg = "Code has several best practice issues: " + ", ".join(issues)
         return score, msg
 
-def evaluate_code(code, criteria=None):
-    """Evaluate code against specified criteria"""
+def evaluate_best_practices(code):
+    """Evaluate adherence to best practices"""
+    return evaluate_best_practices_from_stats(_collect_stats(code))
+
+def _resolve_criteria(criteria):
+    """List the valid criteria to evaluate, falling back to the defaults"""
     if not criteria:
         criteria = DEFAULT_CRITERIA
     
-    results = {}
-    total_score = 0
-    max_possible = 0
-    
     # Ensure all criteria are valid
-    valid_criteria = [c for c in criteria if c in CRITERIA_DESCRIPTIONS]
-    
-    # Always check correctness first
+    return [c for c in criteria if c in CRITERIA_DESCRIPTIONS]
+
+# Evaluators for criteria with a dedicated check, each mapping CodeStats to
+# (score, message). Correctness is checked separately since the other
+# evaluations depend on its outcome.
+_EVALUATORS = {
+    "documentation": evaluate_documentation_from_stats,
+    "efficiency": evaluate_efficiency_from_stats,
+    "readability": evaluate_readability_from_stats,
+    "best_practices": evaluate_best_practices_from_stats
+}
+
+def _evaluate_one(criterion, stats):
+    """Score code on a single criterion other than correctness"""
+    evaluator = _EVALUATORS.get(criterion)
+    if evaluator is None:
+        # For criteria we don't have specific evaluators yet,
+        # provide a placeholder message
+        return CriterionResult(5, 10, f"Basic {criterion} check - detailed evaluation not implemented yet.")
+    score, message = evaluator(stats)
+    return CriterionResult(score, 10, message)
+
+def _score_criteria(code, valid_criteria):
+    """Score code on each of the given valid criteria.
+
+    Returns the per-criterion results, the scores that make up the total (a
+    criterion listed twice is counted twice), the score they are out of, and
+    whether evaluation stopped early because of syntax errors.
+    """
+    correctness = None
+    tree = None
     if "correctness" in valid_criteria:
-        score, message = evaluate_syntactic_correctness(code)
-        results["correctness"] = {
-            "score": score,
-            "max_score": 10,
-            "message": message
-        }
-        total_score += score
-        max_possible += 10
-        
-        # If code has syntax errors, other evaluations may not be meaningful
-        if score < 3:
-            for c in valid_criteria:
-                if c != "correctness" and c not in results:
-                    results[c] = {
-                        "score": 0,
-                        "max_score": 10,
-                        "message": "Not evaluated due to syntax errors"
-                    }
-            return {
-                "total_score": total_score,
-                "max_score": len(valid_criteria) * 10,
-                "percentage": (total_score / max_possible) * 100 if max_possible > 0 else 0,
-                "criteria_results": results,
-                "summary": "Code has syntax errors that need to be fixed before other aspects can be evaluated."
-            }
-    
-    # Process other criteria
-    for criterion in valid_criteria:
-        if criterion == "correctness" and "correctness" in results:
-            continue  # Already evaluated
-            
-        if criterion == "documentation":
-            score, message = evaluate_documentation(code)
-        elif criterion == "efficiency":
-            score, message = evaluate_efficiency(code)
-        elif criterion == "readability":
-            score, message = evaluate_readability(code)
-        elif criterion == "best_practices":
-            score, message = evaluate_best_practices(code)
-        else:
-            # For criteria we don't have specific evaluators yet,
-            # provide a placeholder message
-            score = 5  # Neutral score
-            message = f"Basic {criterion} check - detailed evaluation not implemented yet."
-        
-        results[criterion] = {
-            "score": score,
-            "max_score": 10,
-            "message": message
-        }
-        
-        total_score += score
-        max_possible += 10
+        score, message, tree = _check_syntax(code)
+        correctness = CriterionResult(score, 10, message)
+    
+    # If code has syntax errors, other evaluations may not be meaningful,
+    # so skip gathering stats. Skipped criteria score zero, so they don't
+    # change the total.
+    syntax_error = correctness is not None and correctness.score < 3
+    
+    # Correctness comes first and is counted once; other criteria are
+    # counted each time they are listed
+    counted = [c for c in valid_criteria if c != "correctness"]
+    if correctness is not None:
+        counted.insert(0, "correctness")
+    
+    # Gather shared facts about the code once for all evaluators
+    stats = None if syntax_error else _collect_stats(code, tree)
+    results = {
+        c: correctness if c == "correctness"
+        else _SYNTAX_ERR_RESULT if syntax_error
+        else _evaluate_one(c, stats)
+        for c in dict.fromkeys(counted)
+    }
+    
+    scores = [results[c].score for c in counted]
+    return results, scores, 10 if syntax_error else 10 * len(scores), syntax_error
+
+def _summarize(percentage, syntax_error=False):
+    """Describe the overall quality score in a sentence"""
+    if syntax_error:
+        return "Code has syntax errors that need to be fixed before other aspects can be evaluated."
+    return _SUMMARIES[_summary_bucket(percentage)]
+
+def _summary_bucket(percentage):
+    """Index into _SUMMARIES for an overall percentage"""
+    return bisect_right(_SUMMARY_THRESHOLDS, percentage)
+
+def _evaluate(code, criteria=None):
+    """Evaluate code, keeping per-criterion results as CriterionResult objects"""
+    valid_criteria = _resolve_criteria(criteria)
+    results, scores, max_possible, syntax_error = _score_criteria(code, valid_criteria)
+    total_score = sum(scores)
     
     # Calculate overall quality score
     percentage = (total_score / max_possible) * 100 if max_possible > 0 else 0
     
-    # Generate summary
-    if percentage >= 80:
-        summary = "High-quality code that follows good practices in most areas."
-    elif percentage >= 60:
-        summary = "Solid code with some areas for improvement."
-    elif percentage >= 40:
-        summary = "Code needs improvement in several key areas."
-    else:
-        summary = "Code has significant issues that should be addressed."
-    
     return {
         "total_score": total_score,
-        "max_score": max_possible,
+        "max_score": len(valid_criteria) * 10 if syntax_error else max_possible,
         "percentage": percentage,
         "criteria_results": results,
-        "summary": summary
+        "summary": _summarize(percentage, syntax_error)
     }
 
+def _to_dict(evaluation):
+    """Convert an internal evaluation into the plain dicts handed to callers"""
+    return dict(evaluation, criteria_results={
+        criterion: asdict(result) for criterion, result in evaluation["criteria_results"].items()
+    })
+
+def evaluate_code(code, criteria=None):
+    """Evaluate code against specified criteria"""
+    return _to_dict(_evaluate(code, criteria))
+
+def _aggregate(scores, max_possible, totals, percentages, buckets):
+    """Sum each row of per-criterion scores and bucket its percentage.
+
+    Written so it runs both as plain Python over lists and as a Numba kernel
+    over arrays; the outputs are filled in place.
+    """
+    for i in range(len(scores)):
+        total = 0
+        row = scores[i]
+        for j in range(len(row)):
+            total += row[j]
+        totals[i] = total
+        
+        percentage = (total / max_possible[i]) * 100 if max_possible[i] > 0 else 0.0
+        percentages[i] = percentage
+        bucket = 0
+        for threshold in _SUMMARY_THRESHOLDS:
+            if percentage >= threshold:
+                bucket += 1
+        buckets[i] = bucket
+
+@functools.cache
+def _load_aggregator():
+    """Return numpy (or None) and the aggregation kernel to use.
+
+    Numba and numpy are optional and slow to import, so they are only loaded
+    the first time a batch is large enough to use them. Without them the
+    kernel runs as plain Python.
+    """
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None, _aggregate
+    return np, njit(cache=True)(_aggregate)
+
+def batch_evaluate(codes, criteria=None):
+    """Evaluate many code samples against the same criteria"""
+    valid_criteria = _resolve_criteria(criteria)
+    scored = [_score_criteria(code, valid_criteria) for code in codes]
+    if not scored:
+        return []
+    
+    count = len(scored)
+    np, aggregate = _load_aggregator() if count >= _NUMBA_MIN_BATCH else (None, _aggregate)
+    if np is not None:
+        width = len(scored[0][1])
+        scores = np.array([row for _, row, _, _ in scored], dtype=np.int8).reshape(count, width)
+        max_possible = np.array([m for _, _, m, _ in scored], dtype=np.int64)
+        totals = np.zeros(count, dtype=np.int64)
+        percentages = np.zeros(count, dtype=np.float64)
+        buckets = np.zeros(count, dtype=np.int8)
+    else:
+        scores = [row for _, row, _, _ in scored]
+        max_possible = [m for _, _, m, _ in scored]
+        totals = [0] * count
+        percentages = [0.0] * count
+        buckets = [0] * count
+    
+    aggregate(scores, max_possible, totals, percentages, buckets)
+    
+    evaluations = []
+    for i, (results, _, _, syntax_error) in enumerate(scored):
+        percentage = float(percentages[i]) if max_possible[i] > 0 else 0
+        evaluations.append(_to_dict({
+            "total_score": int(totals[i]),
+            "max_score": len(valid_criteria) * 10 if syntax_error else int(max_possible[i]),
+            "percentage": percentage,
+            "criteria_results": results,
+            "summary": _summarize(percentage, True) if syntax_error else _SUMMARIES[int(buckets[i])]
+        }))
+    return evaluations
+
+@functools.lru_cache(maxsize=256)
+def _evaluate_cached(code, criteria):
+    """Memoized _evaluate; criteria must be a hashable tuple"""
+    return _evaluate(code, criteria)
+
 def run(params):
     """Main function for the SelfEval tool"""
     code = params.get("code", "")
@@ -303,8 +588,10 @@ def run(params):
             "status": "failed"
         }
     
-    # Evaluate the code
-    evaluation = evaluate_code(code, criteria)
+    # Evaluate the code, reusing earlier results for identical submissions.
+    # Converting to dicts gives each caller its own copy of the cached result.
+    criteria = tuple(criteria) if criteria else None
+    evaluation = _to_dict(_evaluate_cached(code, criteria))
     
     return {
         "evaluation": evaluation,
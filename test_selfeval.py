@@ -0,0 +1,230 @@
+# Tests for the SelfEval module
+
+import unittest
+from unittest import mock
+
+import selfeval
+
+SAMPLES = [
+    '''"""Module docstring."""
+
+LIMIT = 5
+WIDTH = 6
+HEIGHT = 7
+DEPTH = 8
+
+def total_items(items):
+    """Sum items with a "quoted" word in the docstring."""
+    # Walk every pair
+    total = 0
+    for i in range(len(items)):
+        for j in items:
+            total += 1
+    values = [v * 2 for v in items]
+    try:
+        with open("data") as fh:
+            pass
+    except:
+        pass
+    return total + 42 + 17 + 99 + 3 + 4 + 5 + 6
+''',
+    "def Bad(:\n  pass\n",
+    "def CamelCase():\n   ab = 3\n   return ab\n",
+    "x = 1\n",
+]
+
+CRITERIA_CASES = [
+    None,
+    [],
+    sorted(selfeval.CRITERIA_DESCRIPTIONS),
+    ["readability", "readability", "correctness", "readability"],
+    ["correctness", "correctness", "security"],
+    ["security", "efficiency"],
+    ["readability", "bogus", None],
+]
+
+try:
+    import numba  # noqa: F401
+    import numpy  # noqa: F401
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+class CorrectnessTest(unittest.TestCase):
+    """Checks made by evaluate_syntactic_correctness"""
+
+    def test_parse_failures_are_cached(self):
+        selfeval._parse.cache_clear()
+        with mock.patch.object(selfeval.ast, "parse", wraps=selfeval.ast.parse) as parse:
+            for _ in range(2):
+                score, message = selfeval.evaluate_syntactic_correctness("def Bad(:\n")
+                self.assertEqual(score, 0)
+                self.assertTrue(message.startswith("Syntax error at line 1"))
+        self.assertEqual(parse.call_count, 1)
+
+class ReadabilityTest(unittest.TestCase):
+    """Checks made by evaluate_readability"""
+
+    def test_indentation_checked_on_every_line(self):
+        # The odd indent is past the first line, which the check used to skip
+        score, message = selfeval.evaluate_readability("x = 1\ndef f():\n      return 2\n")
+        self.assertEqual(score, 5)
+        self.assertIn("inconsistent indentation", message)
+
+    def test_four_space_indentation_passes(self):
+        score, message = selfeval.evaluate_readability("x = 1\ndef f():\n    return 2\n")
+        self.assertEqual(score, 7)
+        self.assertNotIn("inconsistent indentation", message)
+
+    def test_long_lines_counted_up_to_cap(self):
+        long_line = "y = '" + "a" * 120 + "'\n"
+        score, message = selfeval.evaluate_readability(long_line * 3)
+        self.assertEqual(score, 4)
+        self.assertIn("Found 3 lines", message)
+        score, message = selfeval.evaluate_readability(long_line * 50)
+        self.assertEqual(score, 4)
+        self.assertIn("Found more than 3 lines", message)
+
+class DocumentationTest(unittest.TestCase):
+    """Checks made by evaluate_documentation"""
+
+    def test_docstring_containing_quotes(self):
+        code = 'def answer():\n    """Return the "answer"."""\n    return 42\n'
+        score, _ = selfeval.evaluate_documentation(code)
+        self.assertEqual(score, 9)
+
+    def test_assigned_triple_quoted_string_is_not_a_docstring(self):
+        code = 'HELP = """Usage: tool [options]"""\nx = 1\ny = 2\n'
+        score, _ = selfeval.evaluate_documentation(code)
+        self.assertEqual(score, 3)
+
+class EfficiencyTest(unittest.TestCase):
+    """Checks made by evaluate_efficiency"""
+
+    def test_range_len_in_for_loop(self):
+        score, message = selfeval.evaluate_efficiency("for i in range(len(a)):\n    print(a[i])\n")
+        self.assertEqual(score, 6)
+        self.assertIn("range(len())", message)
+
+    def test_range_len_in_comprehension(self):
+        # Loses a point for range(len()) and gains one for the comprehension
+        score, message = selfeval.evaluate_efficiency("b = [a[i] for i in range(len(a))]\n")
+        self.assertEqual(score, 7)
+        self.assertIn("range(len())", message)
+
+    def test_nested_loops_at_any_depth(self):
+        # Both outer loops contain a nested loop, though not as a direct child
+        code = (
+            "def grid(rows):\n"
+            "    for row in rows:\n"
+            "        if row:\n"
+            "            for cell in row:\n"
+            "                for part in cell:\n"
+            "                    print(part)\n"
+        )
+        score, message = selfeval.evaluate_efficiency(code)
+        self.assertEqual(score, 5)
+        self.assertIn("Found 2 nested loops", message)
+
+class BestPracticesTest(unittest.TestCase):
+    """Checks made by evaluate_best_practices"""
+
+    def test_with_counts_statements_not_words(self):
+        code = 'def read(path):\n    """Read a file, within reason."""\n    with open(path) as fh:\n        return fh.read()\n'
+        score, message = selfeval.evaluate_best_practices(code)
+        self.assertEqual(score, 8)
+        self.assertIn("(1 with statements)", message)
+
+    def test_except_in_comment_is_not_a_handler(self):
+        code = "try:\n    pass\n# nothing to except here\nexcept ValueError:\n    pass\n"
+        score, message = selfeval.evaluate_best_practices(code)
+        self.assertEqual(score, 8)
+        self.assertIn("Uses proper exception handling", message)
+
+    def test_bare_except(self):
+        score, message = selfeval.evaluate_best_practices("try:\n    pass\nexcept:\n    pass\n")
+        self.assertEqual(score, 6)
+        self.assertIn("bare except", message)
+
+class EvaluateCodeTest(unittest.TestCase):
+    """Totals reported by evaluate_code"""
+
+    def test_repeated_criterion_counts_each_time(self):
+        evaluation = selfeval.evaluate_code("x = 1\n", ["readability", "readability"])
+        self.assertEqual(evaluation["total_score"], 14)
+        self.assertEqual(evaluation["max_score"], 20)
+        self.assertEqual(list(evaluation["criteria_results"]), ["readability"])
+
+    def test_summary_thresholds_are_inclusive(self):
+        for percentage, summary in ((39.9, 0), (40, 1), (59.9, 1), (60, 2), (79.9, 2), (80, 3), (100, 3)):
+            with self.subTest(percentage=percentage):
+                self.assertEqual(selfeval._summarize(percentage), selfeval._SUMMARIES[summary])
+
+    def test_syntax_error_results_are_independent(self):
+        first = selfeval.evaluate_code("def Bad(:\n")
+        first["criteria_results"]["efficiency"]["score"] = 9
+        second = selfeval.evaluate_code("def Bad(:\n")
+        self.assertEqual(second["criteria_results"]["efficiency"]["score"], 0)
+        self.assertEqual(second["criteria_results"]["readability"]["score"], 0)
+
+class BatchEvaluateTest(unittest.TestCase):
+    """batch_evaluate must agree with evaluate_code on every input"""
+
+    def assert_matches_evaluate_code(self):
+        for criteria in CRITERIA_CASES:
+            with self.subTest(criteria=criteria):
+                expected = [selfeval.evaluate_code(code, criteria) for code in SAMPLES]
+                self.assertEqual(selfeval.batch_evaluate(SAMPLES, criteria), expected)
+
+    def test_pure_python_aggregation(self):
+        self.assert_matches_evaluate_code()
+
+    @unittest.skipUnless(HAS_NUMBA, "numba and numpy are not installed")
+    def test_numba_aggregation(self):
+        np, aggregate = selfeval._load_aggregator()
+        self.assertIsNotNone(np)
+        self.assertIsNot(aggregate, selfeval._aggregate)
+        with mock.patch.object(selfeval, "_NUMBA_MIN_BATCH", 0):
+            self.assert_matches_evaluate_code()
+
+    def test_criteria_iterator_is_read_once(self):
+        criteria = ["efficiency", "correctness", "readability"]
+        expected = [selfeval.evaluate_code(code, criteria) for code in SAMPLES]
+        for threshold in (0, selfeval._NUMBA_MIN_BATCH):
+            with self.subTest(threshold=threshold), mock.patch.object(selfeval, "_NUMBA_MIN_BATCH", threshold):
+                self.assertEqual(selfeval.batch_evaluate(SAMPLES, iter(criteria)), expected)
+
+    def test_syntax_error_summary(self):
+        [evaluation] = selfeval.batch_evaluate(["def Bad(:\n"])
+        self.assertEqual(evaluation["total_score"], 0)
+        self.assertIn("syntax errors", evaluation["summary"])
+
+    def test_no_codes(self):
+        self.assertEqual(selfeval.batch_evaluate([]), [])
+
+class RunTest(unittest.TestCase):
+    """run() must handle the same criteria shapes as evaluate_code"""
+
+    def test_empty_criteria_fall_back_to_defaults(self):
+        for criteria in ([], set(), None):
+            with self.subTest(criteria=criteria):
+                result = selfeval.run({"code": "x = 1\n", "criteria": criteria})
+                self.assertEqual(list(result["evaluation"]["criteria_results"]), selfeval.DEFAULT_CRITERIA)
+
+    def test_invalid_criteria_are_ignored(self):
+        result = selfeval.run({"code": "x = 1\n", "criteria": ["readability", None, 5]})
+        self.assertEqual(list(result["evaluation"]["criteria_results"]), ["readability"])
+
+    def test_criteria_order_is_kept(self):
+        criteria = ["readability", "documentation"]
+        result = selfeval.run({"code": "x = 1\n", "criteria": criteria})
+        self.assertEqual(result["evaluation"], selfeval.evaluate_code("x = 1\n", criteria))
+
+    def test_cached_result_is_not_shared(self):
+        first = selfeval.run({"code": "x = 1\n"})
+        first["evaluation"]["criteria_results"]["correctness"]["score"] = -1
+        second = selfeval.run({"code": "x = 1\n"})
+        self.assertEqual(second["evaluation"]["criteria_results"]["correctness"]["score"], 10)
+
+if __name__ == "__main__":
+    unittest.main()